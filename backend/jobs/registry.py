@@ -0,0 +1,62 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config import DATABASE_URL
+from jobs.reports import term_report, subject_summary, leave_statistics
+
+
+@dataclass(frozen=True)
+class JobClass:
+    handler: Callable[[AsyncSession, dict], Awaitable[dict]]
+    # How many jobs of this class the worker runs at the same time.
+    max_concurrency: int
+    # Size of the connection pool each running job gets; jobs never overflow it.
+    db_connections: int
+    # Seconds a job may run before it is cancelled and recorded as FAILED.
+    timeout: float
+
+
+JOB_CLASSES = {
+    "term_report": JobClass(handler=term_report, max_concurrency=2, db_connections=1, timeout=600),
+    "subject_summary": JobClass(handler=subject_summary, max_concurrency=2, db_connections=1, timeout=300),
+    "leave_statistics": JobClass(handler=leave_statistics, max_concurrency=1, db_connections=1, timeout=300),
+}
+
+
+# Set in each pool process by init_process; see jobs.worker.JobPool.
+_started_queue = None
+
+
+def init_process(started_queue):
+    """Pool initializer: keep the queue used to tell the worker which process runs which job."""
+    global _started_queue
+    _started_queue = started_queue
+
+
+async def _run_job(job_type: str, params: dict) -> dict:
+    job_class = JOB_CLASSES[job_type]
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=job_class.db_connections,
+        max_overflow=0,
+    )
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            return await asyncio.wait_for(job_class.handler(db, params), job_class.timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Job exceeded its {job_class.timeout:g}s timeout") from None
+    finally:
+        await engine.dispose()
+
+
+def run_job(job_id: int, job_type: str, params: dict) -> dict:
+    """
+    Run a single job to completion. This is what the worker submits to its process pool,
+    so each job gets its own event loop and its own engine, separate from the API's pool.
+    """
+    if _started_queue is not None:
+        _started_queue.put((job_id, os.getpid()))
+    return asyncio.run(_run_job(job_type, params))
@@ -0,0 +1,88 @@
+from datetime import date
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models import Attendance, Leave, TeacherSubject
+
+
+def _date_range(column, params: dict):
+    """Build the optional start_date / end_date filters shared by every report."""
+    filters = []
+    if params.get("start_date"):
+        filters.append(column >= date.fromisoformat(params["start_date"]))
+    if params.get("end_date"):
+        filters.append(column <= date.fromisoformat(params["end_date"]))
+    return filters
+
+
+async def _attendance_counts(db: AsyncSession, params: dict, column, key: str) -> list:
+    """
+    Attendance counts by status, grouped by `column` and returned as rows keyed by `key`.
+    """
+    filters = _date_range(Attendance.date, params)
+    if params.get("subject"):
+        filters.append(Attendance.subject == params["subject"])
+
+    result = await db.execute(
+        select(column, Attendance.status, func.count(Attendance.id))
+        .filter(*filters)
+        .group_by(column, Attendance.status)
+    )
+
+    groups = {}
+    for value, attendance_status, count in result.all():
+        row = groups.setdefault(value, {key: value, "PRESENT": 0, "ABSENT": 0, "LEAVE": 0})
+        row[attendance_status.value] = count
+
+    for row in groups.values():
+        total = row["PRESENT"] + row["ABSENT"] + row["LEAVE"]
+        row["total"] = total
+        row["percentage"] = round(row["PRESENT"] * 100 / total, 2) if total else 0.0
+
+    return sorted(groups.values(), key=lambda row: row[key])
+
+
+async def term_report(db: AsyncSession, params: dict) -> dict:
+    """
+    Per-student attendance counts for a term, optionally narrowed to one subject.
+    """
+    return {"students": await _attendance_counts(db, params, Attendance.user_id, "user_id")}
+
+
+async def subject_summary(db: AsyncSession, params: dict) -> dict:
+    """
+    Attendance counts per subject.
+    """
+    return {"subjects": await _attendance_counts(db, params, Attendance.subject, "subject")}
+
+
+async def leave_statistics(db: AsyncSession, params: dict) -> dict:
+    """
+    Leave counts by status, per teacher subject.
+    """
+    filters = _date_range(Leave.date, params)
+    if params.get("subject"):
+        filters.append(TeacherSubject.subject == params["subject"])
+
+    result = await db.execute(
+        select(TeacherSubject.subject, Leave.teacher_subject_id, Leave.status, func.count(Leave.id))
+        .join(TeacherSubject, Leave.teacher_subject_id == TeacherSubject.teacher_id)
+        .filter(*filters)
+        .group_by(TeacherSubject.subject, Leave.teacher_subject_id, Leave.status)
+    )
+
+    totals = {"PENDING": 0, "APPROVED": 0, "REJECTED": 0}
+    subjects = {}
+    for subject, teacher_subject_id, leave_status, count in result.all():
+        row = subjects.setdefault(
+            teacher_subject_id,
+            {"teacher_subject_id": teacher_subject_id, "subject": subject, "PENDING": 0, "APPROVED": 0, "REJECTED": 0},
+        )
+        row[leave_status.value] = count
+        totals[leave_status.value] += count
+
+    return {
+        "totals": totals,
+        "subjects": sorted(subjects.values(), key=lambda row: row["subject"]),
+    }
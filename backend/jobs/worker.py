@@ -0,0 +1,248 @@
+"""
+Background job worker.
+
+Run it next to the API with:
+
+    python -m jobs.worker
+
+It polls the jobs table for PENDING jobs, claims them and runs them in a process pool,
+respecting the per-class limits in jobs.registry.JOB_CLASSES. RUNNING jobs left behind by a
+worker that died or was restarted are put back to PENDING once they are older than their
+class timeout plus JOB_STALE_GRACE. If a pool process dies, the pool is replaced, the job it
+was running is marked FAILED and the other jobs caught in the broken pool are re-queued.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+
+from config import DATABASE_URL
+from models import Job, JobStatus
+from jobs.registry import JOB_CLASSES, init_process, run_job
+
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_STALE_GRACE = float(os.getenv("JOB_STALE_GRACE", "300"))
+JOB_STALE_CHECK_INTERVAL = float(os.getenv("JOB_STALE_CHECK_INTERVAL", "60"))
+JOB_WORKER_PROCESSES = int(
+    os.getenv("JOB_WORKER_PROCESSES", sum(job_class.max_concurrency for job_class in JOB_CLASSES.values()))
+)
+
+# The worker itself only claims and finishes jobs, so it needs a very small pool.
+engine = create_async_engine(DATABASE_URL, pool_size=2, max_overflow=0)
+
+WorkerSessionLocal = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+
+class JobCrashed(Exception):
+    """The pool process running the job died."""
+
+
+class JobInterrupted(Exception):
+    """The job was lost because another job's process died and broke the pool."""
+
+
+class JobPool:
+    """
+    A process pool that replaces itself when one of its processes dies.
+
+    A dead child (OOM kill, segfault, kill -9) breaks a ProcessPoolExecutor for good and fails
+    every job in it with BrokenProcessPool. Children report which job they picked up, so after
+    a break only the job whose process died raises JobCrashed; the rest raise JobInterrupted.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        # spawn, not fork: children must not inherit the parent's open DB connections.
+        self.context = multiprocessing.get_context("spawn")
+        self.started = self.context.SimpleQueue()
+        self.job_pids = {}
+        self.crashed = weakref.WeakKeyDictionary()
+        self.lock = asyncio.Lock()
+        self._create()
+
+    def _create(self):
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.context,
+            initializer=init_process,
+            initargs=(self.started,)
+        )
+        # shutdown() drops the executor's reference to its processes, but their exit codes are
+        # what tells us which one died, so keep our own.
+        self.processes = self.executor._processes
+
+    def _drain_started(self):
+        while not self.started.empty():
+            job_id, pid = self.started.get()
+            self.job_pids[job_id] = pid
+
+    async def _replace(self, broken: ProcessPoolExecutor):
+        """Replace a broken executor (once) and return the ids of the jobs whose process died."""
+        async with self.lock:
+            if broken in self.crashed:
+                return self.crashed[broken]
+
+            processes = self.processes
+            # Wait until the executor has terminated and joined its processes so exit codes are final.
+            await asyncio.to_thread(broken.shutdown, wait=True)
+            self._drain_started()
+
+            # The executor stops the surviving processes with SIGTERM; anything else died on its own.
+            dead_pids = {
+                pid for pid, process in processes.items()
+                if process.exitcode not in (None, 0, -signal.SIGTERM)
+            }
+            crashed = {job_id for job_id, pid in self.job_pids.items() if pid in dead_pids}
+            self.crashed[broken] = crashed
+
+            self._create()
+            print(f"Job process pool broke (dead pids: {sorted(dead_pids)}), started a new one")
+            return crashed
+
+    async def run(self, job_id: int, job_type: str, params: dict) -> dict:
+        executor = self.executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, run_job, job_id, job_type, params)
+        except BrokenProcessPool:
+            if job_id in await self._replace(executor):
+                raise JobCrashed("The process running this job terminated abruptly") from None
+            raise JobInterrupted() from None
+        finally:
+            self._drain_started()
+            self.job_pids.pop(job_id, None)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def claim_jobs(job_type: str, limit: int):
+    """
+    Mark up to `limit` pending jobs of the given type as RUNNING and return their ids and params.
+    SKIP LOCKED lets several workers poll the same table without claiming the same job twice.
+    """
+    async with WorkerSessionLocal() as db:
+        result = await db.execute(
+            select(Job)
+            .filter(Job.job_type == job_type, Job.status == JobStatus.PENDING)
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = result.scalars().all()
+        for job in jobs:
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.utcnow()
+        await db.commit()
+        return [(job.id, job.params) for job in jobs]
+
+
+async def requeue_stale_jobs(in_flight):
+    """
+    Put RUNNING jobs back to PENDING once they have been running longer than their class
+    timeout plus JOB_STALE_GRACE. Jobs are cancelled at their timeout, so such rows belong to a
+    worker that is gone. Jobs this worker is still waiting on are never touched.
+    """
+    now = datetime.utcnow()
+    async with WorkerSessionLocal() as db:
+        for job_type, job_class in JOB_CLASSES.items():
+            cutoff = now - timedelta(seconds=job_class.timeout + JOB_STALE_GRACE)
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.job_type == job_type,
+                    Job.status == JobStatus.RUNNING,
+                    Job.started_at < cutoff,
+                    Job.id.notin_(in_flight)
+                )
+                .values(status=JobStatus.PENDING, started_at=None)
+            )
+            if result.rowcount:
+                print(f"Re-queued {result.rowcount} stale {job_type} job(s)")
+        await db.commit()
+
+
+async def requeue_job(job_id: int):
+    async with WorkerSessionLocal() as db:
+        job = await db.get(Job, job_id)
+        if not job or job.status != JobStatus.RUNNING:
+            return
+        job.status = JobStatus.PENDING
+        job.started_at = None
+        await db.commit()
+
+
+async def finish_job(job_id: int, job_status: JobStatus, result=None, error=None):
+    async with WorkerSessionLocal() as db:
+        job = await db.get(Job, job_id)
+        # The job may have been re-queued as stale in the meantime; leave it to its new owner.
+        if not job or job.status != JobStatus.RUNNING:
+            return
+        job.status = job_status
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        await db.commit()
+
+
+async def execute_job(pool: JobPool, job_id: int, job_type: str, params: dict):
+    try:
+        result = await pool.run(job_id, job_type, params)
+    except JobInterrupted:
+        print(f"Job {job_id} ({job_type}) was interrupted by a crashed pool process, re-queueing")
+        await requeue_job(job_id)
+    except Exception as e:
+        print(f"Job {job_id} ({job_type}) failed:", e)
+        await finish_job(job_id, JobStatus.FAILED, error=str(e) or e.__class__.__name__)
+    else:
+        await finish_job(job_id, JobStatus.COMPLETED, result=result)
+
+
+async def main():
+    running = {job_type: {} for job_type in JOB_CLASSES}
+    last_stale_check = None
+    pool = JobPool(JOB_WORKER_PROCESSES)
+
+    try:
+        print(f"Job worker started with {JOB_WORKER_PROCESSES} processes")
+        loop = asyncio.get_running_loop()
+        while True:
+            # A failing poll (e.g. the database restarting) must not take down the loop and
+            # with it the jobs that are still running; just try again on the next tick.
+            try:
+                if last_stale_check is None or loop.time() - last_stale_check >= JOB_STALE_CHECK_INTERVAL:
+                    in_flight = [job_id for jobs in running.values() for job_id in jobs]
+                    await requeue_stale_jobs(in_flight)
+                    last_stale_check = loop.time()
+
+                for job_type, job_class in JOB_CLASSES.items():
+                    free_slots = job_class.max_concurrency - len(running[job_type])
+                    if free_slots <= 0:
+                        continue
+                    for job_id, params in await claim_jobs(job_type, free_slots):
+                        task = asyncio.create_task(execute_job(pool, job_id, job_type, params))
+                        running[job_type][job_id] = task
+                        task.add_done_callback(
+                            lambda _, jobs=running[job_type], job_id=job_id: jobs.pop(job_id, None)
+                        )
+            except Exception as e:
+                print("Job worker poll failed:", e)
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from routers.auth.auth import auth_router
 from routers.attendance.attendance import attendance_router
 from routers.leave.leave import leave_router
+from routers.jobs.jobs import jobs_router
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -9,6 +10,7 @@ app = FastAPI()
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(attendance_router, prefix="/attendance", tags=["Attendance"])
 app.include_router(leave_router, prefix="/leave", tags=["Leaves"])
+app.include_router(jobs_router, prefix="/jobs", tags=["Jobs"])
 
 @app.get("/")
 def home():
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_db
+from crud import get_user_by_clerkId
+from models import Job, JobStatus
+from routers.jobs.schemas import ReportJobCreate, JobOut
+
+jobs_router = APIRouter()
+
+@jobs_router.post("/reports", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def submit_report_job(
+    job_data: ReportJobCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue a report job. The report itself is computed by the job worker (python -m jobs.worker),
+    never inside this request; poll GET /jobs/{job_id} until it is COMPLETED.
+    """
+    if job_data.requested_by and not await get_user_by_clerkId(db, job_data.requested_by):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    new_job = Job(
+        job_type=job_data.job_type.value,
+        params=job_data.params.model_dump(mode="json", exclude_none=True),
+        status=JobStatus.PENDING,
+        requested_by=job_data.requested_by
+    )
+    db.add(new_job)
+    await db.commit()
+    await db.refresh(new_job)
+    return new_job
+
+@jobs_router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Get the status of a job."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@jobs_router.get("/{job_id}/result")
+async def download_job_result(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Download the result of a completed job as a JSON file."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+    return JSONResponse(
+        content=job.result,
+        headers={"Content-Disposition": f'attachment; filename="{job.job_type}_{job.id}.json"'}
+    )
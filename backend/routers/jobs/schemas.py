@@ -0,0 +1,47 @@
+from pydantic import BaseModel, model_validator
+from datetime import date, datetime
+from typing import Optional
+from enum import Enum
+
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class ReportType(str, Enum):
+    TERM_REPORT = "term_report"
+    SUBJECT_SUMMARY = "subject_summary"
+    LEAVE_STATISTICS = "leave_statistics"
+
+class ReportParams(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    subject: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("start_date must be on or before end_date")
+        return self
+
+class ReportJobCreate(BaseModel):
+    """Schema for submitting a report job."""
+    job_type: ReportType
+    params: ReportParams = ReportParams()
+    requested_by: Optional[str] = None
+
+class JobOut(BaseModel):
+    """Schema for returning job status to the client (without the result itself)."""
+    id: int
+    job_type: str
+    params: dict
+    status: JobStatus
+    error: Optional[str] = None
+    requested_by: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True